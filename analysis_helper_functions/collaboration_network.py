@@ -0,0 +1,107 @@
+# This python script is used to build yearly collaboration networks of awarded
+# authors and derive their centrality measures (later used in
+# `collboration_network.ipynb`).
+# Resources consulted online:
+    # 1) https://networkx.org/documentation/stable/reference/algorithms/centrality.html
+    # 2) https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.explode.html
+
+import pandas as pd
+import networkx as nx
+from instrumentation import stage
+
+def build_collaborations_df(df):
+    '''
+    Pairs each awarded author with the coauthors of their publications.
+
+    Inputs:
+        1) df: a pandas DataFrame of preprocessed publications ('coauthors'
+            stored as lists) with a 'before_after_award' column
+
+    Returns: a pandas DataFrame of (author's email, coauthor) collaborations
+        with publication year and before/after award information
+    '''
+
+    with stage('build_collaborations_df') as metrics:
+        # Explode the DataFrame on the 'coauthors' column to get each collaboration on a separate row
+        exploded_df = df.explode('coauthors')
+
+        # Create tuples of (author's email, coauthor) for each row in the exploded DataFrame
+        collaborations = [(row['email'], coauthor) for _, row in exploded_df.iterrows() for coauthor in [row['coauthors']]]
+
+        # Create a DataFrame from the collaboration counts
+        collaborations_df = pd.DataFrame({
+            'email': [email for email, _ in collaborations],
+            'collaboration': collaborations,
+        })
+
+        # Add year related information to the collaborations_df
+        collaborations_df = pd.merge(df[['email', 'publication_year', 'before_after_award']],
+                                     collaborations_df, on='email', how='inner')
+        metrics.count('items', len(df))
+        metrics.count('rows', len(collaborations_df))
+
+    return collaborations_df
+
+
+def build_yearly_networks(collaborations_df):
+    '''
+    Builds a weighted collaboration network for each publication year.
+
+    Inputs:
+        1) collaborations_df: a pandas DataFrame returned by `build_collaborations_df`
+
+    Returns: a dictionary mapping publication year to a networkx Graph, where
+        edge weight is the number of collaborations between two authors
+    '''
+
+    with stage('build_yearly_networks') as metrics:
+        yearly_networks = {}
+
+        for year, group in collaborations_df.groupby('publication_year'):
+            G_year = nx.Graph()
+            for _, row in group.iterrows():
+                author_email, coauthor = row['collaboration']
+                # Dynamically count the number of collaboration between two authors for each year
+                if G_year.has_edge(author_email, coauthor):
+                    # If it exists, increment the weight by 1
+                    G_year[author_email][coauthor]['weight'] += 1
+                else:
+                    # Otherwise, add a new edge with weight 1
+                    G_year.add_edge(author_email, coauthor, weight=1)
+
+            yearly_networks[year] = G_year
+
+        metrics.count('items', len(collaborations_df))
+        metrics.count('networks', len(yearly_networks))
+
+    return yearly_networks
+
+
+def compute_yearly_centrality(yearly_networks):
+    '''
+    Derives degree and closeness centrality measures of each yearly network.
+
+    Inputs:
+        1) yearly_networks: a dictionary returned by `build_yearly_networks`
+
+    Returns: a tuple of 1) a dictionary mapping year to degree centrality of
+        each author; 2) a dictionary mapping year to closeness centrality of
+        each author
+    '''
+
+    with stage('compute_yearly_centrality') as metrics:
+        yearly_degree_centrality = {}
+        yearly_closeness_centrality = {}
+
+        for year, network in yearly_networks.items():
+            metrics.count('items', network.number_of_nodes())
+
+            print(f"Begin deriving degree centrality measures for year {year}")
+            with metrics.timer('degree_seconds'):
+                yearly_degree_centrality[year] = nx.degree_centrality(network)
+
+            print(f"Begin deriving closeness centrality measures for year {year}")
+            with metrics.timer('closeness_seconds'):
+                yearly_closeness_centrality[year] = nx.closeness_centrality(network)
+
+    return yearly_degree_centrality, yearly_closeness_centrality
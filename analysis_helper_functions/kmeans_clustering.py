@@ -0,0 +1,73 @@
+# This python script is used to vectorize authors' concatenated abstracts with
+# TF-IDF and cluster them with K-means (later used in `kmeans_clustering.ipynb`).
+# Resources consulted online:
+    # 1) https://medium.com/@cmukesh8688/tf-idf-vectorizer-scikit-learn-dbc0244a911a
+    # 2) https://scikit-learn.org/stable/modules/generated/sklearn.cluster.KMeans.html
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import PCA
+from sklearn.cluster import KMeans
+from instrumentation import stage
+
+def vectorize_abstracts(documents, max_features=10000):
+    '''
+    Builds the TF-IDF matrix of authors' concatenated abstracts.
+
+    Inputs:
+        1) documents: an iterable of authors' concatenated normalized abstracts
+        2) max_features: size of the TF-IDF vocabulary
+
+    Returns: a tuple of 1) the fitted TfidfVectorizer; 2) the dense TF-IDF matrix
+    '''
+
+    with stage('vectorize_abstracts', max_features=max_features) as metrics:
+        tfidf_vectorizer = TfidfVectorizer(max_features=max_features)
+
+        # generate a sparse TF-IDF matrix
+        tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
+
+        # convert the sparse TF-IDF matrix to a dense matrix
+        tfidf_matrix = tfidf_matrix.toarray()
+        metrics.count('items', tfidf_matrix.shape[0])
+
+    return tfidf_vectorizer, tfidf_matrix
+
+
+def reduce_tfidf_matrix(tfidf_matrix, n_components, random_state=42):
+    '''
+    Reduces the dimension of a dense TF-IDF matrix with PCA.
+
+    Inputs:
+        1) tfidf_matrix: dense TF-IDF matrix
+        2) n_components: number of PCA components to keep
+        3) random_state: random seed of PCA
+
+    Returns: the reduced TF-IDF matrix
+    '''
+
+    with stage('reduce_tfidf_matrix', n_components=n_components) as metrics:
+        pca = PCA(n_components=n_components, random_state=random_state)
+        tfidf_matrix_reduced = pca.fit_transform(tfidf_matrix)
+        metrics.count('items', tfidf_matrix_reduced.shape[0])
+
+    return tfidf_matrix_reduced
+
+
+def fit_kmeans(matrix, n_clusters, random_state=42):
+    '''
+    Performs K-means clustering on a (reduced) TF-IDF matrix.
+
+    Inputs:
+        1) matrix: (reduced) TF-IDF matrix
+        2) n_clusters: number of clusters
+        3) random_state: random seed of K-means
+
+    Returns: the fitted KMeans model
+    '''
+
+    with stage('fit_kmeans', n_clusters=n_clusters) as metrics:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
+        kmeans.fit(matrix)
+        metrics.count('items', len(matrix))
+
+    return kmeans
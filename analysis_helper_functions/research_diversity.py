@@ -0,0 +1,48 @@
+# This python script is used to measure the topic diversity of an author's
+# publications from the SciBERT embeddings of their abstracts (later used in
+# `research_diversity.ipynb`).
+# Resources consulted online:
+    # 1) https://docs.scipy.org/doc/scipy/reference/generated/scipy.spatial.distance.pdist.html
+    # 2) https://docs.scipy.org/doc/scipy/reference/generated/scipy.stats.entropy.html
+
+import numpy as np
+from scipy.spatial.distance import pdist, squareform
+from scipy.stats import entropy
+
+def calculate_mean_cosine_distance(embedding_matrix):
+    '''
+    Calculates the mean cosine distance within the embedding matrix of the
+    author's publications (either before or after NSF funding).
+
+    Inputs:
+        1) embedding_matrix: a numpy array with one abstract embedding per row
+
+    Returns: mean pairwise cosine distance
+    '''
+
+    cosine_distance = pdist(embedding_matrix, 'cosine')
+    cosine_distance_matrix = squareform(cosine_distance)
+    mean_cosine_distance = np.mean(cosine_distance_matrix)
+
+    return mean_cosine_distance
+
+
+def calculate_cosine_distance_entropy(embedding_matrix):
+    '''
+    Calculates the entropy of cosine distance within the embedding matrix of
+    the author's publications (either before or after NSF funding): A higher
+    entropy value suggests a more diverse or spread-out set of distances.
+
+    Inputs:
+        1) embedding_matrix: a numpy array with one abstract embedding per row
+
+    Returns: entropy (base 2) of normalized pairwise cosine distances
+    '''
+
+    cosine_distance = pdist(embedding_matrix, 'cosine')
+
+    # Normalize cosine distances to sum to 1
+    distance_probabilities = cosine_distance / np.sum(cosine_distance)
+    cosine_distance_entropy = entropy(distance_probabilities, base=2)
+
+    return cosine_distance_entropy
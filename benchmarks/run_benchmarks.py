@@ -0,0 +1,391 @@
+# This python script is used to benchmark the throughput and peak memory of each
+# stage of the pipeline on synthetic inputs (generated by `synthetic_data.py`),
+# and to record the results as a JSON baseline or compare them against one.
+# Run it from the top-level repo directory, e.g.
+#     python -m benchmarks.run_benchmarks --scale small --save-baseline
+#     python -m benchmarks.run_benchmarks --scale small
+# Resources consulted online:
+    # 1) https://docs.python.org/3/library/tracemalloc.html
+    # 2) https://docs.python.org/3/library/time.html#time.perf_counter
+    # 3) https://docs.python.org/3/library/argparse.html
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+from data_processing.scraping_helper_functions.get_all_NSF import process_all_folders
+from data_processing.cleaning_helper_functions.clean_content_analysis import clean_data
+from analysis_helper_functions.collaboration_network import build_collaborations_df, \
+    build_yearly_networks, compute_yearly_centrality
+from analysis_helper_functions.kmeans_clustering import vectorize_abstracts, \
+    reduce_tfidf_matrix, fit_kmeans
+from analysis_helper_functions.research_diversity import calculate_mean_cosine_distance, \
+    calculate_cosine_distance_entropy
+from .synthetic_data import DIRECTORATE, DIVISION, write_nsf_awards, write_scholar_pages, \
+    make_content_analysis, make_preprocessed_content_analysis, make_embedding_matrices
+
+# Sizes of the synthetic inputs at each scale
+SCALES = {
+    "small": {"nsf_awards_per_year": 100, "scholar_profiles": 5, "scholar_papers": 20,
+              "content_rows": 20000, "preprocessed_rows": 1000, "authors": 200,
+              "embedding_groups": 200, "papers_per_group": 10},
+    "medium": {"nsf_awards_per_year": 500, "scholar_profiles": 20, "scholar_papers": 100,
+               "content_rows": 100000, "preprocessed_rows": 5000, "authors": 1000,
+               "embedding_groups": 1000, "papers_per_group": 20},
+    "large": {"nsf_awards_per_year": 2500, "scholar_profiles": 50, "scholar_papers": 250,
+              "content_rows": 500000, "preprocessed_rows": 20000, "authors": 4000,
+              "embedding_groups": 4000, "papers_per_group": 30}
+}
+
+DEFAULT_BASELINE_DIR = os.path.join("benchmarks", "baselines")
+
+# Minimum duration of one timed sample (short stages are called several times per sample)
+MIN_SAMPLE_SECONDS = 0.2
+
+
+def measure(func, repeat, min_time=MIN_SAMPLE_SECONDS):
+    '''
+    Measures the wall time and peak memory of calling `func`.
+
+    As in `timeit.Timer.autorange`, `func` is called 1, 2, 5, 10, 20, ... times
+    per sample until one sample takes at least `min_time` seconds, and `repeat`
+    samples are then timed with that number of calls (garbage is collected
+    before each sample so that earlier samples do not slow it down). Peak
+    memory is measured with tracemalloc in one extra call (tracing slows the
+    call down, so it is kept out of the timed samples). Anything `func` prints
+    is discarded.
+
+    Inputs:
+        1) func: a function without arguments
+        2) repeat: number of timed samples
+        3) min_time: minimum duration of one sample in seconds
+
+    Returns: a tuple of 1) a list of the per-call wall time of each sample in
+        seconds; 2) peak traced memory in bytes
+    '''
+
+    def time_sample(number):
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+
+    def calibrate():
+        power = 1
+        while True:
+            for multiple in (1, 2, 5):
+                if time_sample(power * multiple) >= min_time:
+                    return power * multiple
+            power *= 10
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Find the number of calls per sample (this also warms up caches)
+        number = calibrate()
+        samples = [time_sample(number) / number for _ in range(repeat)]
+
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return samples, peak
+
+
+def prepare_stage_benchmarks(workdir, sizes):
+    '''
+    Generates the synthetic inputs of the offline stages and pairs each stage
+    with the number of items it processes.
+
+    Inputs:
+        1) workdir: directory to write synthetic files to
+        2) sizes: a dictionary of input sizes (one of `SCALES`)
+
+    Returns: a dictionary mapping benchmark name to a tuple of 1) number of
+        items processed; 2) a function without arguments running the stage
+    '''
+
+    benchmarks = {}
+
+    # NSF award xml files (2011 to 2020, as in `get_all_NSF.py`)
+    nsf_path = os.path.join(workdir, "nsf_data")
+    n_files = write_nsf_awards(nsf_path, 2011, 2020, sizes["nsf_awards_per_year"])
+    benchmarks["process_all_folders"] = (n_files, lambda: process_all_folders(
+        nsf_path, 2011, 2020, filter_directorate=DIRECTORATE, filter_division=DIVISION))
+
+    # Raw content_analysis table
+    content_analysis_path = os.path.join(workdir, "content_analysis.csv")
+    make_content_analysis(sizes["content_rows"], sizes["authors"]).to_csv(content_analysis_path)
+    benchmarks["clean_data"] = (sizes["content_rows"], lambda: clean_data(content_analysis_path))
+
+    # Collaboration networks
+    preprocessed_df = make_preprocessed_content_analysis(sizes["preprocessed_rows"], sizes["authors"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        collaborations_df = build_collaborations_df(preprocessed_df)
+        yearly_networks = build_yearly_networks(collaborations_df)
+    n_nodes = sum(network.number_of_nodes() for network in yearly_networks.values())
+    benchmarks["build_collaborations_df"] = (len(preprocessed_df), lambda: build_collaborations_df(preprocessed_df))
+    benchmarks["build_yearly_networks"] = (len(collaborations_df), lambda: build_yearly_networks(collaborations_df))
+    benchmarks["compute_yearly_centrality"] = (n_nodes, lambda: compute_yearly_centrality(yearly_networks))
+
+    # TF-IDF and K-means clustering (authors' abstracts concatenated as in `kmeans_clustering.ipynb`)
+    preprocessed_df["normalized_abstract"] = preprocessed_df["normalized_abstract"].apply(lambda x: ' '.join(x))
+    documents = preprocessed_df.groupby("email")["normalized_abstract"].apply(lambda x: '. '.join(x))
+    _, tfidf_matrix = vectorize_abstracts(documents)
+    n_components = min(100, min(tfidf_matrix.shape) - 1)
+    tfidf_matrix_reduced = reduce_tfidf_matrix(tfidf_matrix, n_components=n_components)
+    benchmarks["vectorize_abstracts"] = (len(documents), lambda: vectorize_abstracts(documents))
+    benchmarks["reduce_tfidf_matrix"] = (len(documents), lambda: reduce_tfidf_matrix(tfidf_matrix, n_components))
+    benchmarks["fit_kmeans"] = (len(documents), lambda: fit_kmeans(tfidf_matrix_reduced, n_clusters=7))
+
+    # Diversity metrics of abstract embeddings
+    embedding_matrices = make_embedding_matrices(sizes["embedding_groups"], sizes["papers_per_group"])
+    benchmarks["calculate_mean_cosine_distance"] = (len(embedding_matrices), lambda: [
+        calculate_mean_cosine_distance(matrix) for matrix in embedding_matrices])
+    benchmarks["calculate_cosine_distance_entropy"] = (len(embedding_matrices), lambda: [
+        calculate_cosine_distance_entropy(matrix) for matrix in embedding_matrices])
+
+    return benchmarks
+
+
+def run_browser_benchmarks(workdir, sizes, repeat, min_time=MIN_SAMPLE_SECONDS, keep_sleeps=False):
+    '''
+    Benchmarks the Google Scholar extraction functions on saved html pages
+    opened through a local headless Chrome (no network access needed).
+
+    The fixed `time.sleep` waits between page loads are skipped unless
+    `keep_sleeps` is set, so the results measure page loads and parsing.
+    Peak memory only covers the Python side, not the browser.
+
+    Inputs:
+        1) workdir: directory to write synthetic html pages to
+        2) sizes: a dictionary of input sizes (one of `SCALES`)
+        3) repeat: number of timed samples
+        4) min_time: minimum duration of one sample in seconds
+        5) keep_sleeps: whether to keep the scrapers' sleeps
+
+    Returns: a dictionary mapping benchmark name to its result
+    '''
+
+    names = ["find_citations", "find_interests", "extract_info_from_html"]
+    try:
+        from data_processing.scraping_helper_functions.get_author_info import find_citations, find_interests
+        from data_processing.scraping_helper_functions.get_pub_info import extract_info_from_html
+        from data_processing.scraping_helper_functions.webdriver_setup import initialize_driver
+        driver = initialize_driver()
+    except Exception as e:
+        print(f"Skipping browser benchmarks: {e}")
+        return {name: {"skipped": str(e)} for name in names}
+
+    profile_paths, paper_paths = write_scholar_pages(os.path.join(workdir, "scholar"),
+                                                     sizes["scholar_profiles"], sizes["scholar_papers"])
+    profile_urls = [pathlib.Path(path).resolve().as_uri() for path in profile_paths]
+    paper_urls = [pathlib.Path(path).resolve().as_uri() for path in paper_paths]
+
+    stages = {
+        "find_citations": (profile_urls, lambda: [find_citations(driver, url) for url in profile_urls]),
+        "find_interests": (profile_urls, lambda: [find_interests(driver, url) for url in profile_urls]),
+        "extract_info_from_html": (paper_urls, lambda: [extract_info_from_html(url, driver) for url in paper_urls])
+    }
+
+    results = {}
+    try:
+        with contextlib.nullcontext() if keep_sleeps else mock.patch("time.sleep"):
+            for name, (urls, func) in stages.items():
+                results[name] = summarize(len(urls), *measure(func, repeat, min_time))
+    finally:
+        driver.quit()
+
+    return results
+
+
+def summarize(n_items, samples, peak_bytes):
+    '''
+    Summarizes one benchmark measurement as a JSON-serializable dictionary,
+    with the median per-call time of the samples and their relative spread
+    ((slowest - fastest) / median).
+    '''
+
+    seconds = statistics.median(samples)
+    return {
+        "items": n_items,
+        "seconds": round(seconds, 6),
+        "spread": round((max(samples) - min(samples)) / seconds, 3) if seconds > 0 else None,
+        "items_per_second": round(n_items / seconds, 3) if seconds > 0 else None,
+        "peak_memory_mb": round(peak_bytes / 2 ** 20, 3)
+    }
+
+
+def run_benchmarks(scale="small", repeat=7, min_time=MIN_SAMPLE_SECONDS, workdir=None, browser=False,
+                   keep_sleeps=False):
+    '''
+    Runs all benchmarks at the given scale.
+
+    Inputs:
+        1) scale: one of `SCALES`
+        2) repeat: number of timed samples per benchmark
+        3) min_time: minimum duration of one sample in seconds
+        4) workdir: directory to write synthetic inputs to (a temporary
+            directory if None)
+        5) browser: whether to also benchmark the Google Scholar extraction
+            functions (needs selenium and Chrome)
+        6) keep_sleeps: whether to keep the scrapers' sleeps in browser benchmarks
+
+    Returns: a dictionary of run information and per-benchmark results
+    '''
+
+    sizes = SCALES[scale]
+    results = {}
+
+    with tempfile.TemporaryDirectory() if workdir is None else contextlib.nullcontext(workdir) as workdir:
+        os.makedirs(workdir, exist_ok=True)
+        for name, (n_items, func) in prepare_stage_benchmarks(workdir, sizes).items():
+            print(f"Benchmarking {name} on {n_items} items")
+            results[name] = summarize(n_items, *measure(func, repeat, min_time))
+
+        if browser:
+            results |= run_browser_benchmarks(workdir, sizes, repeat, min_time, keep_sleeps)
+
+    return {
+        "scale": scale,
+        "sizes": sizes,
+        "repeat": repeat,
+        "min_time": min_time,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results
+    }
+
+
+def check_baseline(results, baseline):
+    '''
+    Checks that results and a baseline were measured on the same workload and
+    Python version, so that their throughput and peak memory are comparable.
+
+    Inputs:
+        1) results: a dictionary returned by `run_benchmarks`
+        2) baseline: a dictionary returned by `run_benchmarks` earlier
+
+    Returns: a tuple of 1) a list of messages describing each mismatch that
+        makes the comparison invalid; 2) a list of messages describing each
+        mismatch that only makes the comparison less reliable
+    '''
+
+    errors, warnings = [], []
+    for key in ("scale", "sizes", "repeat", "min_time", "python"):
+        if baseline.get(key) != results[key]:
+            errors.append(f"{key}: {baseline.get(key)} in baseline vs {results[key]} now")
+
+    # A different machine or OS changes timings without changing the workload
+    if baseline.get("platform") != results["platform"]:
+        warnings.append(f"platform: {baseline.get('platform')} in baseline vs {results['platform']} now")
+
+    return errors, warnings
+
+
+def compare_to_baseline(results, baseline, tolerance=0.1):
+    '''
+    Compares benchmark results against a baseline.
+
+    A benchmark's throughput only counts as a regression if it drops by more
+    than `tolerance` plus the larger of the two runs' spreads (so run-to-run
+    noise of the machine is not reported as a regression). Peak memory is
+    deterministic, so it counts as a regression if it rises by more than
+    `tolerance`.
+
+    Inputs:
+        1) results: a dictionary returned by `run_benchmarks`
+        2) baseline: a dictionary returned by `run_benchmarks` earlier
+        3) tolerance: allowed relative drop in throughput (on top of the
+            spread) or rise in peak memory
+
+    Returns: a list of messages describing each regression (empty if none)
+    '''
+
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None or "skipped" in result or "skipped" in base:
+            continue
+
+        allowed = tolerance + max(result["spread"] or 0, base.get("spread") or 0)
+        if result["items_per_second"] and base["items_per_second"] and \
+                result["items_per_second"] < base["items_per_second"] * (1 - allowed):
+            regressions.append(f"{name}: throughput {result['items_per_second']:.1f} items/s "
+                               f"vs baseline {base['items_per_second']:.1f} items/s "
+                               f"(allowed drop {allowed:.0%})")
+        if result["peak_memory_mb"] > base["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak memory {result['peak_memory_mb']:.1f} MB "
+                               f"vs baseline {base['peak_memory_mb']:.1f} MB")
+
+    return regressions
+
+
+# Use this function with the command-line interface
+if __name__ == "__main__":
+    # Initialize the parser
+    parser = argparse.ArgumentParser(description='Benchmark pipeline stages on synthetic inputs and compare against a JSON baseline.')
+
+    # Add arguments
+    parser.add_argument('--scale', type=str, default="small", choices=list(SCALES), help='Size of the synthetic inputs.')
+    parser.add_argument('--repeat', type=int, default=7, help='Number of timed samples per benchmark (the median is kept).')
+    parser.add_argument('--min-time', type=float, default=MIN_SAMPLE_SECONDS, help='Minimum duration of one timed sample in seconds.')
+    parser.add_argument('--workdir', type=str, default=None, help='Directory to write synthetic inputs to (temporary if omitted).')
+    parser.add_argument('--baseline', type=str, default=None, help='Path of the JSON baseline (default: benchmarks/baselines/<scale>.json).')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the new baseline instead of comparing.')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative drop in throughput (on top of the run-to-run spread) or rise in peak memory.')
+    parser.add_argument('--browser', action='store_true', help='Also benchmark the Google Scholar extraction functions (needs Chrome).')
+    parser.add_argument('--keep-sleeps', action='store_true', help='Keep the scrapers\' sleeps in browser benchmarks.')
+
+    # Parse the arguments
+    args = parser.parse_args()
+    baseline_path = args.baseline or os.path.join(DEFAULT_BASELINE_DIR, f"{args.scale}.json")
+
+    results = run_benchmarks(scale=args.scale, repeat=args.repeat, min_time=args.min_time, workdir=args.workdir,
+                             browser=args.browser, keep_sleeps=args.keep_sleeps)
+    print(json.dumps(results["benchmarks"], indent=2))
+
+    if args.save_baseline:
+        # Ensure the directory exists before saving
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {baseline_path}.")
+    elif not os.path.exists(baseline_path):
+        print(f"The baseline {baseline_path} does not exist. Run again with --save-baseline to create it.")
+    else:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+        # Refuse to compare results of a different workload or Python version
+        errors, warnings = check_baseline(results, baseline)
+        for warning in warnings:
+            print(f"Warning: {warning}")
+        if errors:
+            print(f"The baseline {baseline_path} is not comparable with these results:")
+            for error in errors:
+                print(f"  {error}")
+            sys.exit("Run again with --save-baseline to record a new baseline.")
+
+        regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against baseline {baseline_path}.")
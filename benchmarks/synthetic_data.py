@@ -0,0 +1,309 @@
+# This python script is used to generate synthetic inputs at configurable scale
+# (NSF award xml files, saved Google Scholar pages, content analysis tables and
+# abstract embeddings), so that every stage of the pipeline can be benchmarked
+# offline with `run_benchmarks.py`.
+# Resources consulted online:
+    # 1) https://lxml.de/tutorial.html#the-element-factory
+    # 2) https://numpy.org/doc/stable/reference/random/generator.html
+
+import html
+import os
+import random
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+DIRECTORATE = "Direct For Social, Behav & Economic Scie"
+DIVISION = "Division Of Behavioral and Cognitive Sci"
+OTHER_DIVISION = "Division Of Social and Economic Sciences"
+
+SYLLABLES = ["ba", "co", "di", "fe", "ga", "hi", "jo", "ku", "la", "me",
+             "no", "pi", "ra", "se", "tu", "vo", "xi", "ze", "lin", "gram"]
+
+INSTITUTIONS = ["University of Chicago", "Stanford University", "Yale University",
+                "University of Michigan", "Ohio State University", "Rice University"]
+
+JOURNALS = ["Cognition", "Psychological Science", "American Anthropologist",
+            "Journal of Memory and Language", "Current Anthropology", "Neuron"]
+
+
+def make_vocabulary(size, seed=0):
+    '''
+    Makes a vocabulary of pronounceable pseudo-words.
+
+    Inputs:
+        1) size: number of distinct words
+        2) seed: random seed
+
+    Returns: a list of distinct words
+    '''
+
+    rng = random.Random(seed)
+    vocabulary = set()
+    while len(vocabulary) < size:
+        vocabulary.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+
+    return sorted(vocabulary)
+
+
+def make_text(rng, vocabulary, n_words):
+    '''
+    Makes a random text of `n_words` words drawn from `vocabulary`.
+    '''
+
+    return " ".join(rng.choice(vocabulary) for _ in range(n_words))
+
+
+def make_author(rng, index):
+    '''
+    Makes the name, email and institution of a synthetic awarded author.
+    '''
+
+    institution = INSTITUTIONS[index % len(INSTITUTIONS)]
+    domain = institution.lower().replace(" ", "") + ".edu"
+    return {
+        "first_name": f"First{index}",
+        "middle_name": rng.choice(["", "A", "B", "C"]),
+        "last_name": f"Last{index}",
+        "email": f"First{index}.Last{index}@{domain}",
+        "institution": institution
+    }
+
+
+def write_nsf_awards(base_path, start_year, end_year, awards_per_year, seed=0):
+    '''
+    Writes synthetic NSF award xml files with the fields read by
+    `extract_data_from_file`, one folder per year (same layout as the
+    unzipped NSF downloads expected by `process_all_folders`).
+
+    Inputs:
+        1) base_path: path to write the yearly folders to
+        2) start_year: first award year
+        3) end_year: last award year
+        4) awards_per_year: number of xml files per year
+        5) seed: random seed
+
+    Returns: total number of xml files written
+    '''
+
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(2000, seed)
+    n_files = 0
+
+    for year in range(start_year, end_year + 1):
+        folder_path = os.path.join(base_path, str(year))
+        os.makedirs(folder_path, exist_ok=True)
+
+        for i in range(awards_per_year):
+            author = make_author(rng, n_files)
+            root = etree.Element("rootTag")
+            award = etree.SubElement(root, "Award")
+            etree.SubElement(award, "AwardTitle").text = make_text(rng, vocabulary, 8)
+            etree.SubElement(award, "AwardEffectiveDate").text = f"09/01/{year}"
+            etree.SubElement(award, "AwardExpirationDate").text = f"08/31/{year + 3}"
+            etree.SubElement(award, "AwardTotalIntnAmount").text = str(rng.randint(10, 900) * 1000)
+            etree.SubElement(award, "AbstractNarration").text = make_text(rng, vocabulary, 300)
+
+            organization = etree.SubElement(award, "Organization")
+            directorate = etree.SubElement(organization, "Directorate")
+            etree.SubElement(directorate, "LongName").text = DIRECTORATE
+            division = etree.SubElement(organization, "Division")
+            # Keep roughly two thirds of awards in the division filtered by default
+            etree.SubElement(division, "LongName").text = DIVISION if rng.random() < 2 / 3 else OTHER_DIVISION
+
+            # Put a co-principal investigator first so the role check is exercised
+            for role, person in (("Co-Principal Investigator", make_author(rng, n_files + 1)),
+                                 ("Principal Investigator", author)):
+                investigator = etree.SubElement(award, "Investigator")
+                etree.SubElement(investigator, "FirstName").text = person["first_name"]
+                etree.SubElement(investigator, "LastName").text = person["last_name"]
+                etree.SubElement(investigator, "PI_MID_INIT").text = person["middle_name"]
+                etree.SubElement(investigator, "EmailAddress").text = f" {person['email']} "
+                etree.SubElement(investigator, "RoleCode").text = role
+
+            institution = etree.SubElement(award, "Institution")
+            etree.SubElement(institution, "Name").text = author["institution"]
+
+            etree.ElementTree(root).write(os.path.join(folder_path, f"{year}{i:05d}.xml"),
+                                          xml_declaration=True, encoding="UTF-8")
+            n_files += 1
+
+    return n_files
+
+
+def write_scholar_pages(output_dir, n_profiles, n_papers, seed=0):
+    '''
+    Writes saved Google Scholar profile and paper pages with the elements read
+    by `find_citations`, `find_interests` and `extract_info_from_html`.
+
+    Inputs:
+        1) output_dir: directory to write the html files to
+        2) n_profiles: number of author profile pages
+        3) n_papers: number of paper detail pages
+        4) seed: random seed
+
+    Returns: a tuple of 1) a list of profile page paths; 2) a list of paper
+        page paths
+    '''
+
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(2000, seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    profile_paths = []
+    for i in range(n_profiles):
+        years = range(2001, 2025)
+        histogram = "".join(f'<span class="gsc_g_t">{year}</span>' for year in years) + \
+            "".join(f'<a class="gsc_g_a" href="#"><span class="gsc_g_al">{rng.randint(0, 500)}</span></a>'
+                    for _ in years)
+        interests = "".join(f'<a class="gsc_prf_inta" href="#">{html.escape(make_text(rng, vocabulary, 2))}</a>'
+                            for _ in range(rng.randint(1, 5)))
+        page = f'''<html><body>
+<div id="gsc_prf_int">{interests}</div>
+<a id="gsc_prf_t-cit" href="#">Cited by</a>
+<table id="gsc_rsb_st"><tbody>
+<tr><td>Citations</td><td>{rng.randint(100, 50000)}</td><td>{rng.randint(50, 20000)}</td></tr>
+<tr><td>h-index</td><td>{rng.randint(5, 120)}</td><td>{rng.randint(5, 80)}</td></tr>
+</tbody></table>
+<div class="gsc_md_hist_w"><div class="gsc_md_hist_b">{histogram}</div></div>
+</body></html>'''
+        path = os.path.join(output_dir, f"profile_{i}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        profile_paths.append(path)
+
+    paper_paths = []
+    for i in range(n_papers):
+        fields = {
+            "Authors": ", ".join(f"F{rng.randint(0, 999)} L{rng.randint(0, 999)}" for _ in range(rng.randint(1, 8))),
+            "Publication date": f"{rng.randint(2008, 2023)}/{rng.randint(1, 12)}",
+            "Journal": rng.choice(JOURNALS)
+        }
+        rows = "".join(f'<div class="gs_scl"><div class="gsc_oci_field">{field}</div>'
+                       f'<div class="gsc_oci_value">{html.escape(value)}</div></div>'
+                       for field, value in fields.items())
+        years = range(2010, 2025)
+        bars = "".join(f'<span class="gsc_oci_g_t">{year}</span>' for year in years) + \
+            "".join(f'<a class="gsc_oci_g_a" href="#"><span class="gsc_oci_g_al">{rng.randint(0, 60)}</span></a>'
+                    for _ in years)
+        page = f'''<html><body><div id="gsc_oci_table">{rows}
+<div class="gs_scl"><div class="gsc_oci_field">Description</div>
+<div class="gsc_oci_value"><div class="gsh_csp">{make_text(rng, vocabulary, 200)}</div></div></div>
+</div><div id="gsc_oci_graph_bars">{bars}</div></body></html>'''
+        path = os.path.join(output_dir, f"paper_{i}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(page)
+        paper_paths.append(path)
+
+    return profile_paths, paper_paths
+
+
+def make_content_analysis(n_rows, n_authors, seed=0):
+    '''
+    Makes a synthetic merged content_analysis table (the output of
+    `merge.ipynb` and input of `clean_data`), including missing values, short
+    abstracts and the columns dropped during cleaning.
+
+    Inputs:
+        1) n_rows: number of publications
+        2) n_authors: number of awarded authors
+        3) seed: random seed
+
+    Returns: a pandas DataFrame of raw content_analysis rows
+    '''
+
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    vocabulary = make_vocabulary(5000, seed)
+    authors = [make_author(rng, i) | {"award_year": 2011 + i % 10} for i in range(n_authors)]
+
+    rows = []
+    for _ in range(n_rows):
+        author = rng.choice(authors)
+        n_abstract_words = rng.choice([0, 10, 150, 200, 250]) if rng.random() < 0.1 else rng.randint(80, 250)
+        rows.append(author | {
+            "directorate": DIRECTORATE,
+            "division": DIVISION,
+            "effective_date": f"09/01/{author['award_year']}",
+            "expiration_date": f"08/31/{author['award_year'] + 3}",
+            "award_amount": rng.randint(10, 900) * 1000,
+            "award_title": make_text(rng, vocabulary, 8),
+            "abstract": make_text(rng, vocabulary, 300),
+            "url": f"https://scholar.google.com/citations?user={author['last_name']}",
+            "total_citations": rng.randint(100, 50000),
+            "h_index": rng.randint(5, 120),
+            "interests": str([make_text(rng, vocabulary, 2)]),
+            "Title": make_text(rng, vocabulary, 10),
+            "Year": author["award_year"] + rng.randint(-3, 3),
+            "Cited by": rng.randint(1, 500) if rng.random() < 0.8 else None,
+            "Paper URL": "https://scholar.google.com/citations?view_op=view_citation",
+            "Authors": ", ".join(f"F{rng.randint(0, 5 * n_authors)} L{rng.randint(0, 999)}"
+                                 for _ in range(rng.randint(1, 8))) if rng.random() < 0.95 else None,
+            "Publication Date": f"{author['award_year']}/1",
+            "Journal": rng.choice(JOURNALS) if rng.random() < 0.8 else None,
+            "Abstract": "abstract not found" if n_abstract_words == 0 else make_text(rng, vocabulary, n_abstract_words),
+            "Citations": "{}"
+        })
+
+    df = pd.DataFrame(rows)
+
+    # Yearly citations are missing outside of the years the author is cited
+    for year in range(2001, 2025):
+        citations = np_rng.integers(0, 50, size=n_rows).astype('float64')
+        citations[np_rng.random(n_rows) < 0.3] = np.nan
+        df[f"citation_{year}"] = citations
+
+    return df
+
+
+def make_preprocessed_content_analysis(n_rows, n_authors, seed=0):
+    '''
+    Makes a synthetic preprocessed content analysis table with the columns used
+    by the collaboration network and clustering analyses.
+
+    Inputs:
+        1) n_rows: number of publications
+        2) n_authors: number of awarded authors
+        3) seed: random seed
+
+    Returns: a pandas DataFrame with 'coauthors' and 'normalized_abstract'
+        stored as lists (as after `ast.literal_eval` in the notebooks)
+    '''
+
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(5000, seed)
+    emails = [make_author(rng, i)["email"].lower() for i in range(n_authors)]
+
+    rows = []
+    for i in range(n_rows):
+        award_year = 2011 + i % n_authors % 10
+        publication_year = award_year + rng.randint(-3, 3)
+        rows.append({
+            "email": emails[i % n_authors],
+            "award_year": award_year,
+            "publication_year": publication_year,
+            "before_after_award": "before_award" if publication_year <= award_year else "after_award",
+            "coauthors": [f"f{rng.randint(0, 5 * n_authors)} l{rng.randint(0, 999)}" for _ in range(rng.randint(1, 8))],
+            "normalized_abstract": make_text(rng, vocabulary, rng.randint(80, 200)).split()
+        })
+
+    return pd.DataFrame(rows)
+
+
+def make_embedding_matrices(n_groups, papers_per_group, dim=768, seed=0):
+    '''
+    Makes synthetic abstract embedding matrices, one per (author,
+    before/after award) group.
+
+    Inputs:
+        1) n_groups: number of embedding matrices
+        2) papers_per_group: maximum number of abstracts (rows) per matrix
+        3) dim: embedding dimension (768 for SciBERT)
+        4) seed: random seed
+
+    Returns: a list of numpy arrays
+    '''
+
+    rng = np.random.default_rng(seed)
+    return [rng.standard_normal((rng.integers(2, papers_per_group + 1), dim)).astype('float32')
+            for _ in range(n_groups)]
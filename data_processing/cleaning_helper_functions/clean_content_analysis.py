@@ -0,0 +1,103 @@
+# This python script is used to clean the merged `content_analysis.csv` table
+# (later tokenized and normalized in `clean.ipynb`).
+# Resources consulted online:
+    # 1) https://pandas.pydata.org/docs/user_guide/io.html#iterating-through-files-chunk-by-chunk
+    # 2) https://pandas.pydata.org/docs/user_guide/text.html
+
+import pandas as pd
+
+# Declares the columns `clean_data` needs from content_analysis.csv, mapping each
+# raw column name to its cleaned name and the dtype it is read with
+CITATION_YEARS = range(2001, 2025)
+
+CONTENT_ANALYSIS_SCHEMA = {
+    'first_name': ('first_name', 'object'),
+    'middle_name': ('middle_name', 'object'),
+    'last_name': ('last_name', 'object'),
+    'email': ('email', 'object'),
+    'institution': ('institution', 'object'),
+    'award_year': ('award_year', 'float64'),
+    'award_amount': ('award_amount', 'float64'),
+    'Title': ('paper_title', 'object'),
+    'Journal': ('journal', 'object'),
+    'Year': ('publication_year', 'float64'),
+    'Authors': ('coauthors', 'object'),
+    'Abstract': ('paper_abstract', 'object'),
+    'Cited by': ('paper_total_citations', 'float64'),
+} | {f'citation_{year}': (f'citation_{year}', 'float64') for year in CITATION_YEARS}
+
+# Count columns whose missing values mean zero citations
+COUNT_COLUMNS = ['paper_total_citations'] + [f'citation_{year}' for year in CITATION_YEARS]
+
+# Columns converted to 'category' once all chunks are concatenated (so that
+# every chunk shares the same categories)
+CATEGORY_COLUMNS = ['institution', 'award_year', 'publication_year', 'journal']
+
+
+def clean_chunk(chunk):
+    '''
+    This function cleans one chunk of content_analysis.csv read with
+    `CONTENT_ANALYSIS_SCHEMA`.
+
+    Inputs:
+        1) chunk: a pandas DataFrame of raw rows
+
+    Returns: a cleaned DataFrame (before category conversion)
+    '''
+
+    # rename and reorder columns
+    chunk = chunk.rename(columns={raw: clean for raw, (clean, _) in CONTENT_ANALYSIS_SCHEMA.items()})
+    chunk = chunk[[clean for clean, _ in CONTENT_ANALYSIS_SCHEMA.values()]]
+
+    # drop rows where 'abstract' is 'abstract not found' or has fewer than 20 words
+    # (the match stops at the 20th word instead of counting every word)
+    abstract = chunk['paper_abstract']
+    has_20_words = abstract.str.match(r'\s*(?:\S+\s+){19}\S', na=False)
+    chunk = chunk[(abstract != 'abstract not found') & has_20_words].copy()
+
+    # convert email and institution names to lowercase
+    chunk['email'] = chunk['email'].str.lower()
+    chunk['institution'] = chunk['institution'].str.lower()
+
+    # convert each row in 'coauthors' to a list of lowercase author names
+    # (missing values become empty lists)
+    coauthors = chunk['coauthors'].str.lower().str.split(', ')
+    missing = coauthors.isna()
+    empty_lists = pd.Series([[] for _ in range(missing.sum())], index=coauthors.index[missing], dtype='object')
+    chunk['coauthors'] = coauthors.where(~missing, empty_lists)
+
+    # replace NaN values with 'journal not found' in 'journal'
+    chunk['journal'] = chunk['journal'].fillna('journal not found')
+
+    # replace missing values in total and yearly citation columns with 0
+    chunk[COUNT_COLUMNS] = chunk[COUNT_COLUMNS].fillna(0)
+
+    # assign integer data types to numeric columns
+    return chunk.astype({'award_year': 'int64', 'award_amount': 'int64', 'publication_year': 'int64'} |
+                        {column: 'int64' for column in COUNT_COLUMNS})
+
+
+def clean_data(load_file_path='../database/content_analysis.csv', chunksize=50000):
+    '''
+    This function cleans the content_analysis table into a pandas DataFrame.
+    Only the columns declared in `CONTENT_ANALYSIS_SCHEMA` are read, and the
+    file is processed `chunksize` rows at a time.
+
+    Inputs:
+        1) load_file_path: file path to load original CSV file
+        2) chunksize: number of rows to read and clean at a time
+
+    Returns: a cleaned DataFrame
+    '''
+
+    # load and clean the CSV file chunk by chunk
+    reader = pd.read_csv(load_file_path, usecols=list(CONTENT_ANALYSIS_SCHEMA),
+                         dtype={raw: dtype for raw, (_, dtype) in CONTENT_ANALYSIS_SCHEMA.items()},
+                         chunksize=chunksize)
+    df = pd.concat([clean_chunk(chunk) for chunk in reader], ignore_index=True)
+
+    # assign 'category' data types
+    df = df.astype({column: 'category' for column in CATEGORY_COLUMNS})
+
+    # return the final cleaned DataFrame
+    return df
@@ -8,6 +8,7 @@ import pandas as pd
 from lxml import etree
 import os
 import argparse
+from instrumentation import stage, configure_metrics
 
 def extract_data_from_file(file_path):
     '''
@@ -79,32 +80,41 @@ def process_all_folders(base_path, start_year, end_year,
     '''
 
     all_data = []
-    for year in range(start_year, end_year + 1):  # Loop through each year
-        print(f"Processing NSF data folder for year {year}:\n")
-        folder_path = os.path.join(base_path, str(year))
-        if os.path.exists(folder_path) and os.path.isdir(folder_path):
-            for filename in os.listdir(folder_path):
-                # Target the .xml file of NSF awards
-                if filename.endswith('.xml'):
-                    file_path = os.path.join(folder_path, filename)
-                    try:
-                        data = extract_data_from_file(file_path)
-                        # Add awarded year to the dictionary
-                        data['year'] = year
-                    except:
-                        pass
-                    # Filter based on given directorate and directorate (if any)
-                    # Assume data should be appended unless a condition fails
-                    should_append = True  
-                    if filter_directorate and data["directorate"] != filter_directorate:
-                        should_append = False
-                    if filter_division and data["division"] != filter_division:
-                        should_append = False
-                    
-                    if should_append:
-                        all_data.append(data)
-
-    return pd.DataFrame(all_data)
+    with stage('process_all_folders', start_year=start_year, end_year=end_year) as metrics:
+        for year in range(start_year, end_year + 1):  # Loop through each year
+            print(f"Processing NSF data folder for year {year}:\n")
+            folder_path = os.path.join(base_path, str(year))
+            if os.path.exists(folder_path) and os.path.isdir(folder_path):
+                for filename in os.listdir(folder_path):
+                    # Target the .xml file of NSF awards
+                    if filename.endswith('.xml'):
+                        file_path = os.path.join(folder_path, filename)
+                        metrics.count('items')
+                        try:
+                            with metrics.timer('parse_seconds'):
+                                data = extract_data_from_file(file_path)
+                            # Add awarded year to the dictionary
+                            data['year'] = year
+                        except:
+                            metrics.count('errors')
+                            # Skip files that failed to parse
+                            continue
+                        # Filter based on given directorate and directorate (if any)
+                        # Assume data should be appended unless a condition fails
+                        should_append = True  
+                        if filter_directorate and data["directorate"] != filter_directorate:
+                            should_append = False
+                        if filter_division and data["division"] != filter_division:
+                            should_append = False
+                        
+                        if should_append:
+                            all_data.append(data)
+
+        with metrics.timer('pandas_seconds'):
+            nsf_df = pd.DataFrame(all_data)
+        metrics.count('rows', len(nsf_df))
+
+    return nsf_df
 
 # Use this function with the command-line interface
 if __name__ == "__main__":
@@ -117,9 +127,12 @@ if __name__ == "__main__":
     parser.add_argument('--end_year', type=int, default=2020, help='Ending year of NSF awards to focus on.')
     parser.add_argument('--filter_directorate', type=str, default="Direct For Social, Behav & Economic Scie", help='Directorate of NSF to filter.')
     parser.add_argument('--filter_division', type=str, default="Division Of Behavioral and Cognitive Sci", help='Division under directorate of NSF to filter.')
+    parser.add_argument('--metrics_path', type=str, default="database/metrics.jsonl", help='JSON-lines file to append stage metrics to.')
+    parser.add_argument('--profile_dir', type=str, default=None, help='Directory to dump cProfile stats of each stage to (no profiling if omitted).')
 
     # Parse the arguments
     args = parser.parse_args()
+    configure_metrics(args.metrics_path, args.profile_dir)
 
     # Construct nsf_data_file_path based on start_year and end_year
     nsf_data_file_path = f'database/funding_info.csv'
@@ -5,8 +5,8 @@
     # 2) https://docs.python.org/3/library/argparse.html
 
 from selenium.webdriver.common.by import By
-import time
-from .webdriver_setup import initialize_driver # Use absolute path to avoid importing issues
+from .webdriver_setup import initialize_driver, load_page # Use absolute path to avoid importing issues
+from instrumentation import stage, current_stage, sleep, configure_metrics
 import pandas as pd
 import argparse
 import os
@@ -25,8 +25,8 @@ def find_url(driver, full_name, email_domain):
 
     # Starting point to search for author's Google Scholar url
     url = f"https://scholar.google.com/citations?hl=en&view_op=search_authors&mauthors={full_name}"
-    driver.get(url)
-    time.sleep(7)
+    load_page(driver, url)
+    sleep(7)
 
     authors = driver.find_elements(By.CSS_SELECTOR, "div.gs_ai.gs_scl.gs_ai_chpr")
     if len(authors) == 1:
@@ -60,25 +60,26 @@ def find_citations(driver, url):
     '''
 
     driver.set_window_size(800, 1000)
-    driver.get(url)
-    time.sleep(3)
+    load_page(driver, url)
+    sleep(3)
 
     cited_by_tab = driver.find_element(By.ID, "gsc_prf_t-cit")
     cited_by_tab.click()
-    time.sleep(3)
+    sleep(3)
 
-    # Extract total number of citation and h-index
-    total_citations = driver.find_element(By.XPATH, '//*[@id="gsc_rsb_st"]/tbody/tr[1]/td[2]').text
-    h_index = driver.find_element(By.XPATH, '//*[@id="gsc_rsb_st"]/tbody/tr[2]/td[2]').text
+    with current_stage().timer('parse_seconds'):
+        # Extract total number of citation and h-index
+        total_citations = driver.find_element(By.XPATH, '//*[@id="gsc_rsb_st"]/tbody/tr[1]/td[2]').text
+        h_index = driver.find_element(By.XPATH, '//*[@id="gsc_rsb_st"]/tbody/tr[2]/td[2]').text
 
-    # Extract yearly citation number
-    year_citations = {}
-    year_elements = driver.find_elements(By.CSS_SELECTOR, "div.gsc_md_hist_w .gsc_g_t")
-    citation_elements = driver.find_elements(By.CSS_SELECTOR, "div.gsc_md_hist_w .gsc_g_a")
+        # Extract yearly citation number
+        year_citations = {}
+        year_elements = driver.find_elements(By.CSS_SELECTOR, "div.gsc_md_hist_w .gsc_g_t")
+        citation_elements = driver.find_elements(By.CSS_SELECTOR, "div.gsc_md_hist_w .gsc_g_a")
 
-    for year, citation in zip(year_elements, citation_elements):
-        citation_count = driver.execute_script("return arguments[0].textContent", citation)
-        year_citations[year.text] = citation_count
+        for year, citation in zip(year_elements, citation_elements):
+            citation_count = driver.execute_script("return arguments[0].textContent", citation)
+            year_citations[year.text] = citation_count
 
     return total_citations, h_index, year_citations
 
@@ -94,14 +95,15 @@ def find_interests(driver, url):
     Returns: a list of awarded author's research interests
     '''
 
-    driver.get(url)
-    time.sleep(3)
+    load_page(driver, url)
+    sleep(3)
 
     interests = []
 
     try:
-        interest = driver.find_elements(By.CSS_SELECTOR, "div#gsc_prf_int a.gsc_prf_inta")
-        interests = [i.text for i in interest] if interest else None
+        with current_stage().timer('parse_seconds'):
+            interest = driver.find_elements(By.CSS_SELECTOR, "div#gsc_prf_int a.gsc_prf_inta")
+            interests = [i.text for i in interest] if interest else None
 
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -128,6 +130,7 @@ def retrieve_author_info(nsf_df, year, driver):
     base_columns = ["first_name", "middle_name", "last_name", "email",
                     "institution", "url", "total_citations", "h_index", "interests"]
     processed_df = pd.DataFrame(columns=base_columns)
+    metrics = current_stage()
  
      # First retrieve the author's Google Scholar's url from 
      # searching author's name on Google Scholar using selenium
@@ -135,6 +138,7 @@ def retrieve_author_info(nsf_df, year, driver):
     for _, row in nsf_df_filtered.iterrows():
         full_name = f"{row['first_name']} {row['last_name']}".strip()
         email_domain = row['email'].split('@')[-1]
+        metrics.count('items')
 
         try:
             url = find_url(driver, full_name, email_domain)
@@ -146,6 +150,7 @@ def retrieve_author_info(nsf_df, year, driver):
                 raise ValueError("URL not found")
         except Exception as e:
             print(f"Error processing {full_name}: {e}")
+            metrics.count('errors')
             url, total_citations, h_index, interests = None, None, None, None
             year_citations = {}
 
@@ -161,16 +166,17 @@ def retrieve_author_info(nsf_df, year, driver):
             "interests": interests
         }
 
-        # Append the new row to the DataFrame
-        new_index = len(processed_df)  # Get the new row's index
-        processed_df = pd.concat([processed_df, pd.DataFrame([new_row])], ignore_index=True)
+        with metrics.timer('pandas_seconds'):
+            # Append the new row to the DataFrame
+            new_index = len(processed_df)  # Get the new row's index
+            processed_df = pd.concat([processed_df, pd.DataFrame([new_row])], ignore_index=True)
 
-        for citation_year, citations in year_citations.items():
-            citation_col_name = f"citation_{citation_year}"
+            for citation_year, citations in year_citations.items():
+                citation_col_name = f"citation_{citation_year}"
 
-            # Directly update the cell for the current author and year
-            # If the column does not exist, it will be automatically added
-            processed_df.loc[new_index, citation_col_name] = citations
+                # Directly update the cell for the current author and year
+                # If the column does not exist, it will be automatically added
+                processed_df.loc[new_index, citation_col_name] = citations
 
     return processed_df
 
@@ -194,42 +200,46 @@ def safe_retrieve_author_info(nsf_df, year):
     # Pre-filter the nsf_df to focus on a specific year
     nsf_df_filtered = nsf_df[nsf_df['year'] == year]
 
-    while not nsf_df_filtered.empty:
-        try:
-            driver = initialize_driver()
-            processed_chunk = retrieve_author_info(nsf_df, year, driver)
-
-            if not processed_chunk.empty:
-                # Append processed_chunk to the consolidated DataFrame
-                processed_data_all = pd.concat([processed_data_all, processed_chunk],
-                                               ignore_index=True)
-                # Drop rows from nsf_df using the emails from processed_chunk
-                processed_emails = processed_chunk['email'].values
-                nsf_df_filtered = nsf_df_filtered[~nsf_df_filtered['email'].isin(processed_emails)]
-            
-            # Check if nsf_df_filtered has only one row (i.e., last author to scrape)
-            # If so, break out of the loop
-            if len(nsf_df_filtered) <= 1:
-                print("All data processed, exiting loop.")
-                break
-        except Exception as e:
-            print(f"An error occurred: {e}")
-            time.sleep(20)  # Wait a bit before retrying or proceeding
-        finally:
-            driver.quit()  # Ensure driver is closed after each iteration
-
-    if not processed_data_all.empty:
-        print(f"Scraped a total number of {len(processed_data_all)} authors.")
-        # Drop authors whose Google Scholar page url is missing
-        processed_data_all_filtered = processed_data_all.dropna(subset=["url"])
-        print(f"{len(processed_data_all_filtered)} authors have intact Google scholar url.")
-
-        # Save the consolidated data to a CSV file
-        processed_data_all_filtered.to_csv(f"database/author_info_{year}.csv",
-                                           index=False, encoding='utf-8-sig')
-        print(f"Successfully processed and saved all data for year {year}.")
-    else:
-        print("No data processed.")
+    with stage('get_author_info', year=year) as metrics:
+        while not nsf_df_filtered.empty:
+            try:
+                driver = initialize_driver()
+                processed_chunk = retrieve_author_info(nsf_df, year, driver)
+
+                if not processed_chunk.empty:
+                    # Append processed_chunk to the consolidated DataFrame
+                    processed_data_all = pd.concat([processed_data_all, processed_chunk],
+                                                   ignore_index=True)
+                    # Drop rows from nsf_df using the emails from processed_chunk
+                    processed_emails = processed_chunk['email'].values
+                    nsf_df_filtered = nsf_df_filtered[~nsf_df_filtered['email'].isin(processed_emails)]
+                
+                # Check if nsf_df_filtered has only one row (i.e., last author to scrape)
+                # If so, break out of the loop
+                if len(nsf_df_filtered) <= 1:
+                    print("All data processed, exiting loop.")
+                    break
+            except Exception as e:
+                print(f"An error occurred: {e}")
+                metrics.count('retries')
+                sleep(20)  # Wait a bit before retrying or proceeding
+            finally:
+                driver.quit()  # Ensure driver is closed after each iteration
+
+        if not processed_data_all.empty:
+            print(f"Scraped a total number of {len(processed_data_all)} authors.")
+            # Drop authors whose Google Scholar page url is missing
+            processed_data_all_filtered = processed_data_all.dropna(subset=["url"])
+            print(f"{len(processed_data_all_filtered)} authors have intact Google scholar url.")
+            metrics.count('rows', len(processed_data_all_filtered))
+
+            # Save the consolidated data to a CSV file
+            with metrics.timer('pandas_seconds'):
+                processed_data_all_filtered.to_csv(f"database/author_info_{year}.csv",
+                                                   index=False, encoding='utf-8-sig')
+            print(f"Successfully processed and saved all data for year {year}.")
+        else:
+            print("No data processed.")
 
 
 # Use this function with the command-line interface
@@ -243,8 +253,13 @@ if __name__ == "__main__":
     # Add the 'year' argument
     parser.add_argument('year', type=int, help='The year of interest for author information retrieval.')
 
+    # Add arguments for stage metrics and profiling
+    parser.add_argument('--metrics_path', type=str, default="database/metrics.jsonl", help='JSON-lines file to append stage metrics to.')
+    parser.add_argument('--profile_dir', type=str, default=None, help='Directory to dump cProfile stats of each stage to (no profiling if omitted).')
+
     # Parse the arguments
     args = parser.parse_args()
+    configure_metrics(args.metrics_path, args.profile_dir)
     funding_info_file_path = args.funding_info_file_path
     year = args.year
     
@@ -1,6 +1,6 @@
-# This python script is used to write a helper function that initialized the
-# selenium webdriver for dynamic web-scraping (later used in `get_author_info.py`
-# and `get_pub_info.py`)
+# This python script is used to write helper functions that initialize the
+# selenium webdriver and load pages for dynamic web-scraping (later used in
+# `get_author_info.py` and `get_pub_info.py`)
 
 # Resources consulted online:
     # 1) https://chromedriver.chromium.org/getting-started
@@ -8,6 +8,8 @@
     # 3) https://www.browserstack.com/guide/python-selenium-to-run-web-automation-test
 
 from selenium import webdriver
+from selenium.webdriver.common.by import By
+from instrumentation import current_stage
 
 def initialize_driver():
     '''
@@ -23,6 +25,45 @@ def initialize_driver():
     options.add_argument('--disable-blink-features=AutomationControlled')
     options.add_argument('--headless=new')
     
-    # Initialize and return the WebDriver
-    driver = webdriver.Chrome(options=options)
-    return driver
\ No newline at end of file
+    # Initialize and return the WebDriver (recording browser starts in the current stage)
+    metrics = current_stage()
+    metrics.count('browser_starts')
+    with metrics.timer('browser_start_seconds'):
+        driver = webdriver.Chrome(options=options)
+    return driver
+
+
+def is_blocked(driver):
+    '''
+    Checks whether Google has answered with an anti-scraping page (a redirect
+    to google.com/sorry or a Google Scholar captcha form).
+
+    Inputs:
+        1) driver: selenium webdriver
+
+    Returns: True if the current page is a block page
+    '''
+
+    return '/sorry/' in driver.current_url or bool(driver.find_elements(By.ID, "gs_captcha_f"))
+
+
+def load_page(driver, url):
+    '''
+    Loads a page, recording the page count, load time and detected blocks in
+    the current stage.
+
+    Inputs:
+        1) driver: selenium webdriver
+        2) url: url of the page to load
+
+    Returns: None
+    '''
+
+    metrics = current_stage()
+    with metrics.timer('load_seconds'):
+        driver.get(url)
+    metrics.count('pages')
+
+    if is_blocked(driver):
+        metrics.count('blocks')
+        print(f"Blocked by anti-scraping when loading {url}")
\ No newline at end of file
@@ -0,0 +1,251 @@
+# This python script is used to record stage-level metrics (wall time, per-stage
+# peak memory, item counts and, for the scrapers, time spent sleeping vs. loading
+# pages, retries, blocks and browser starts) as JSON lines, with an optional
+# cProfile dump per stage (used across the scraping and analysis helpers).
+# Resources consulted online:
+    # 1) https://docs.python.org/3/library/contextlib.html#contextlib.contextmanager
+    # 2) https://docs.python.org/3/library/resource.html
+    # 3) https://docs.python.org/3/library/profile.html
+    # 4) https://man7.org/linux/man-pages/man5/proc_pid_clear_refs.5.html
+
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+# Where metrics and profiles are written (nothing is written until configured)
+_metrics_path = None
+_profile_dir = None
+
+# Stages currently running (innermost last)
+_active_stages = []
+
+
+def configure_metrics(metrics_path=None, profile_dir=None):
+    '''
+    Configures where stage metrics (and optional cProfile stats) are written.
+
+    Inputs:
+        1) metrics_path: path of the JSON-lines file to append one record per
+            stage to (metrics are not written if None)
+        2) profile_dir: directory to dump cProfile stats of each outermost
+            stage to (no profiling if None)
+
+    Returns: None
+    '''
+
+    global _metrics_path, _profile_dir
+    _metrics_path = metrics_path
+    _profile_dir = profile_dir
+
+
+def process_peak_rss_mb():
+    '''
+    Returns the peak resident set size of the process so far (in MB), or None
+    where the `resource` module is unavailable (e.g., Windows).
+    '''
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10, 3)
+
+
+def read_status_mb(key):
+    '''
+    Returns the `key` field (e.g., 'VmRSS', 'VmHWM') of /proc/self/status in
+    MB, or None where it is unavailable (i.e., outside Linux).
+    '''
+
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(f"{key}:"):
+                    return int(line.split()[1]) / 2 ** 10
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def reset_peak_rss():
+    '''
+    Resets the peak resident set size of the process (VmHWM) to its current
+    resident set size, so that the peak of each stage can be read separately.
+
+    Returns: whether the reset succeeded (only possible on Linux)
+    '''
+
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+def fold_peak_rss():
+    '''
+    Folds the peak resident set size since the last reset into the peak of
+    every running stage (so a stage's peak includes its nested stages).
+    '''
+
+    peak = read_status_mb('VmHWM')
+    if peak is None:
+        return
+    for metrics in _active_stages:
+        metrics.peak_rss_mb = max(metrics.peak_rss_mb or 0, peak)
+
+
+class StageMetrics:
+    '''
+    Collects the counters and time buckets of one stage.
+    '''
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.counts = {}
+        self.seconds = {}
+        self.peak_rss_mb = None
+
+    def count(self, key, n=1):
+        '''
+        Adds `n` to the counter `key` (e.g., 'items', 'pages', 'retries').
+        '''
+
+        self.counts[key] = self.counts.get(key, 0) + n
+
+    def add_time(self, key, seconds):
+        '''
+        Adds `seconds` to the time bucket `key` (e.g., 'sleep_seconds').
+        '''
+
+        self.seconds[key] = self.seconds.get(key, 0) + seconds
+
+    @contextmanager
+    def timer(self, key):
+        '''
+        Adds the wall time of the enclosed block to the time bucket `key`.
+        '''
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(key, time.perf_counter() - start)
+
+
+def current_stage():
+    '''
+    Returns the innermost running stage, or a detached StageMetrics (never
+    written) if no stage is running.
+    '''
+
+    return _active_stages[-1] if _active_stages else StageMetrics(None)
+
+
+def sleep(seconds):
+    '''
+    Sleeps like `time.sleep` and records it in the current stage's 'sleep_seconds'.
+    '''
+
+    with current_stage().timer('sleep_seconds'):
+        time.sleep(seconds)
+
+
+def write_record(record):
+    '''
+    Appends one record to the configured JSON-lines metrics file.
+    '''
+
+    if _metrics_path is None:
+        return
+
+    # Ensure the directory exists before saving
+    if os.path.dirname(_metrics_path):
+        os.makedirs(os.path.dirname(_metrics_path), exist_ok=True)
+    with open(_metrics_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+@contextmanager
+def stage(name, **fields):
+    '''
+    Records the metrics of the enclosed block as one stage.
+
+    The record holds the stage name, its parent stage, `fields`, wall time,
+    the RSS at the start and the peak RSS during the stage, every counter and
+    time bucket collected through the yielded StageMetrics, and a per-second
+    rate for 'items' and 'pages'. Per-stage peak RSS needs Linux; elsewhere
+    the process' peak RSS so far is recorded as 'process_peak_rss_mb'.
+
+    Inputs:
+        1) name: name of the stage
+        2) fields: extra JSON-serializable fields to record (e.g., year)
+
+    Yields: the StageMetrics of the stage
+    '''
+
+    metrics = StageMetrics(name, **fields)
+    parent = _active_stages[-1].name if _active_stages else None
+
+    # Only profile outermost stages (cProfile profilers cannot be nested)
+    profiler = cProfile.Profile() if _profile_dir and not _active_stages else None
+
+    # Reset the peak RSS for this stage (after folding it into the running stages)
+    fold_peak_rss()
+    per_stage_rss = reset_peak_rss()
+    rss_start_mb = read_status_mb('VmRSS') if per_stage_rss else None
+
+    _active_stages.append(metrics)
+    started_at = datetime.now().isoformat(timespec='seconds')
+    start = time.perf_counter()
+    status, error = 'ok', None
+    if profiler:
+        profiler.enable()
+
+    try:
+        yield metrics
+    except BaseException as e:
+        status, error = 'error', f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        wall_seconds = time.perf_counter() - start
+        if per_stage_rss:
+            fold_peak_rss()
+        _active_stages.pop()
+
+        record = {"stage": name, "parent": parent, "started_at": started_at,
+                  "status": status, "error": error} | metrics.fields
+        record["wall_seconds"] = round(wall_seconds, 6)
+        if per_stage_rss and metrics.peak_rss_mb is not None:
+            record["rss_start_mb"] = round(rss_start_mb, 3)
+            record["peak_rss_mb"] = round(metrics.peak_rss_mb, 3)
+        else:
+            record["process_peak_rss_mb"] = process_peak_rss_mb()
+        record |= metrics.counts
+        record |= {key: round(seconds, 6) for key, seconds in metrics.seconds.items()}
+
+        # Derive rates and the number of browser restarts
+        for key in ('items', 'pages'):
+            if key in metrics.counts and wall_seconds > 0:
+                record[f"{key}_per_second"] = round(metrics.counts[key] / wall_seconds, 3)
+        if 'browser_starts' in metrics.counts:
+            record["browser_restarts"] = max(metrics.counts['browser_starts'] - 1, 0)
+
+        if profiler:
+            os.makedirs(_profile_dir, exist_ok=True)
+            profile_path = os.path.join(_profile_dir, f"{name}_{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.prof")
+            profiler.dump_stats(profile_path)
+            record["profile_path"] = profile_path
+
+        write_record(record)